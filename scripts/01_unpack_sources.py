@@ -1,3 +1,4 @@
+import shutil
 import zipfile
 from pathlib import Path
 
@@ -10,6 +11,21 @@ OUT.mkdir(parents=True, exist_ok=True)
 for z in SRC.glob("*.zip"):
     target = OUT / z.stem
     target.mkdir(parents=True, exist_ok=True)
+    target_real = target.resolve()
     with zipfile.ZipFile(z, "r") as zf:
-        zf.extractall(target)
+        # Copy members ourselves in one chunk sized to each file, rather than
+        # extractall's default small-chunk copy
+        for info in zf.infolist():
+            dest = target / info.filename
+            if not dest.resolve().is_relative_to(target_real):
+                raise ValueError(f"Refusing to unpack {info.filename!r} outside {target}")
+            if info.is_dir():
+                dest.mkdir(parents=True, exist_ok=True)
+                continue
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            if info.file_size == 0:
+                dest.touch()
+                continue
+            with zf.open(info) as src, open(dest, "wb") as dst:
+                shutil.copyfileobj(src, dst, min(info.file_size, 1 << 20))
     print(f"Unpacked {z.name} -> {target}")
@@ -17,10 +17,16 @@ Notes:
 - It is intentionally conservative: it preserves content but normalises spacing/markup artefacts.
 """
 
-import json
 import re
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
 from pathlib import Path
 
+try:
+    import orjson as _json
+except ImportError:  # stdlib json: same dumps name, but returns str (see write_json)
+    import json as _json
+
 
 # ----------------------------
 # Paths
@@ -34,19 +40,14 @@ OUT.mkdir(parents=True, exist_ok=True)
 # ----------------------------
 # USFM structural regexes
 # ----------------------------
-C_RE = re.compile(r"^\\c\s+(\d+)\s*$")
-V_RE = re.compile(r"^\\v\s+(\d+)([a-z]?)\s+(.*)$")
-
-# Poetry / paragraph markers (often appear on their own lines)
-Q_RE = re.compile(r"^\\q(\d*)\s+(.*)$")   # \q, \q1, \q2 ...
-M_RE = re.compile(r"^\\m\s+(.*)$")        # \m ...
-P_RE = re.compile(r"^\\p\s+(.*)$")        # \p ...
+# Markers are dispatched on their leading token (see parse_usfm_file);
+# only the verse marker needs a regex to split its parameters.
+V_RE = re.compile(r"^(\d+)([a-z]?)\s+(.*)$")   # "12a text" after \v
 
 
 # ----------------------------
 # Footnote extraction (USFM)
 # ----------------------------
-FOOTNOTE_BLOCK_RE = re.compile(r"\\f\b.*?\\f\*", re.DOTALL)
 FR_RE = re.compile(r"\\fr\b\s*([^\\]+)")
 FT_RE = re.compile(r"\\ft\b\s*([^\\]+)")
 
@@ -55,105 +56,133 @@ FT_RE = re.compile(r"\\ft\b\s*([^\\]+)")
 PLUS_MARK_RE = re.compile(r"\\\+[A-Za-z]+[* ]?")  # matches \+wh and \+wh* etc.
 
 # Markers inserted into verse strings so the LaTeX generator can turn them into \footnote{...}
-FOOTNOTE_DELIM = "\u241EFOOTNOTE\u241E"  # ␞FOOTNOTE␞ (very unlikely in source)
+FOOTNOTE_DELIM = "\uE000"   # Private Use Area: never occurs in source text
 
-ADD_OPEN = "\u241EADDOPEN\u241E"
-ADD_CLOSE = "\u241EADDCLOSE\u241E"
-SC_OPEN = "\u241ESCOPEN\u241E"
-SC_CLOSE = "\u241ESCCLOSE\u241E"
-SUP_OPEN = "\u241ESUPOPEN\u241E"
-SUP_CLOSE = "\u241ESUPCLOSE\u241E"
+ADD_OPEN = "\uE001"
+ADD_CLOSE = "\uE002"
+SC_OPEN = "\uE003"
+SC_CLOSE = "\uE004"
+SUP_OPEN = "\uE005"
+SUP_CLOSE = "\uE006"
 
-def extract_usfm_footnotes(raw: str) -> str:
+def render_footnote(block: str) -> str:
     """
-    Return text with USFM footnote blocks replaced inline by FOOTNOTE_DELIM markers.
+    Return a USFM footnote block as an inline FOOTNOTE_DELIM-wrapped note.
 
-    Turns:  ... \f + \fr 1:2 \ft Note text...\f* ...
-    Into:   ... ␞FOOTNOTE␞1:2: Note text...␞FOOTNOTE␞ ...
+    Turns:  \f + \fr 1:2 \ft Note text...\f*
+    Into:   <FN>1:2: Note text...<FN>   (<FN> = FOOTNOTE_DELIM)
 
     - Extracts \ft content (concatenates multiple \ft pieces)
     - If \fr exists, prefixes note with 'ref: ' (your current behaviour)
     - Removes \+xx / \+xx* inline markers inside the footnote so \ft capture isn't truncated
     """
+    # Remove inline character-style markers (e.g., \+wh ... \+wh*)
+    block = PLUS_MARK_RE.sub("", block)
 
-    def repl(match):
-        block = match.group(0)
-
-        # Remove inline character-style markers (e.g., \+wh ... \+wh*)
-        block = PLUS_MARK_RE.sub("", block)
-
-        fr_m = FR_RE.search(block)
-        fr = fr_m.group(1).strip() if fr_m else ""
+    fr_m = FR_RE.search(block)
+    fr = fr_m.group(1).strip() if fr_m else ""
 
-        fts = [m.group(1).strip() for m in FT_RE.finditer(block)]
-        ft = " ".join(fts).strip()
+    fts = [m.group(1).strip() for m in FT_RE.finditer(block)]
+    ft = " ".join(fts).strip()
 
-        if not ft:
-            # Delete empty footnote blocks
-            return " "
+    if not ft:
+        # Delete empty footnote blocks
+        return " "
 
-        note = f"{fr}: {ft}" if fr else ft
+    note = f"{fr}: {ft}" if fr else ft
 
-        # Inline footnote marker at the exact position
-        return f"{FOOTNOTE_DELIM}{note}{FOOTNOTE_DELIM} "
-
-    return FOOTNOTE_BLOCK_RE.sub(repl, raw)
+    # Inline footnote marker at the exact position
+    return f"{FOOTNOTE_DELIM}{note}{FOOTNOTE_DELIM} "
 
 # ----------------------------
-# Inline cleanup / normalisation
+# Inline markup scanner
 # ----------------------------
+FOOTNOTE_BLOCK_RE = re.compile(r"\\f\b.*?\\f\*", re.DOTALL)
+KEEP_MARK_RE = re.compile(r"\\add\*|\\add |\\sc\*|\\sc |\\sup\*|\\sup ")  # kept as sentinels
+PLUS_STYLE_RE = re.compile(r"\\\+[A-Za-z]+\*?")     # nested styles \+wh, \+wh* outside footnotes
+
+# Everything else is a plain deletion, done with replacement-string passes
 PIPE_ATTR_RE = re.compile(r'\|[A-Za-z]+="[^"]*"')   # |strong="H3068", |lemma="..."
-USFM_MARK_RE = re.compile(r'\\[A-Za-z]+\d*\*?')     # \w, \w*, \add, \add*, etc.
+USFM_MARK_RE = re.compile(r'\\[A-Za-z]+\d*\*?')     # \w, \w*, \nd, \nd*, etc.
 STAR_RE = re.compile(r"\*+")                        # stray * markers (some editions)
 
-def normalise_line(line: str) -> str:
-    """
-    Clean a fragment of verse text (not the whole verse structure).
-    IMPORTANT: Footnotes should already be extracted before calling this.
+_MARKER_MAP = {
+    "\\add*": ADD_CLOSE,
+    "\\add ": ADD_OPEN,
+    "\\sc*": SC_CLOSE,
+    "\\sc ": SC_OPEN,
+    "\\sup*": SUP_CLOSE,
+    "\\sup ": SUP_OPEN,
+}
+
+def scan_markup(raw: str) -> str:
     """
+    Resolve all USFM inline markup in a fragment of verse text:
+    footnotes become FOOTNOTE_DELIM notes, \add/\sc/\sup become sentinel
+    delimiters, and everything else is dropped.
 
+    Each pass is skipped when the fragment lacks the character it starts with.
+    Footnote notes are spliced in before the pipe/star passes, so they are cleaned too.
+    """
     # Normalise non-breaking spaces
-    line = line.replace("\u00A0", " ")
-
-    line = line.replace("\\add*", ADD_CLOSE)
-    line = line.replace("\\add ", ADD_OPEN)
-    line = line.replace("\\sc*", SC_CLOSE)
-    line = line.replace("\\sc ", SC_OPEN)
-    line = line.replace("\\sup*", SUP_CLOSE)
-    line = line.replace("\\sup ", SUP_OPEN)
-    
-    # Remove pipe attributes (Strong’s/lemma/etc.)
-    line = PIPE_ATTR_RE.sub("", line)
+    if "\u00A0" in raw:
+        raw = raw.replace("\u00A0", " ")
+
+    if "\\" in raw:
+        if "\\f" in raw:
+            raw = FOOTNOTE_BLOCK_RE.sub(lambda m: render_footnote(m.group(0)), raw)
+        raw = KEEP_MARK_RE.sub(lambda m: _MARKER_MAP[m.group(0)], raw)
+        if "\\+" in raw:
+            raw = PLUS_STYLE_RE.sub("", raw)
+        # Markers go before stars so a closing \nd* cannot glue onto the next word
+        raw = USFM_MARK_RE.sub(" ", raw)
+
+    if "|" in raw:
+        # Remove pipe attributes (Strong’s/lemma/etc.), then stray pipes
+        raw = PIPE_ATTR_RE.sub("", raw)
+        raw = raw.replace("|", " ")
+
+    if "*" in raw:
+        raw = STAR_RE.sub("", raw)
 
-    # Remove leftover star markers
-    line = STAR_RE.sub("", line)
+    return raw
 
-    # Remove USFM inline markers (replace with a space to preserve word breaks)
-    line = USFM_MARK_RE.sub(" ", line)
+# ----------------------------
+# Inline cleanup / normalisation
+# ----------------------------
+_WS_RE = re.compile(r"\s+")
+_APOS_RE = re.compile(r"(?<=\w)\s*([’'])\s*(?=\w)")       # don ' t -> don't
+_QOPEN_RE = re.compile(r"([‘“'\"])\s+(\w)")                # ‘ I -> ‘I
+_QCLOSE_RE = re.compile(r"([”\"])(\w)")                     # ”for -> ” for
+_QPUNCT_RE = re.compile(r"([,.;:!?])([’'])(\w)")            # ;’for -> ;’ for
+_PUNCT_SPACE_RE = re.compile(r"\s+([,.;:!?])")              # word , -> word,
 
-    # Remove stray pipes
-    line = line.replace("|", " ")
+def normalise_line(line: str) -> str:
+    """
+    Clean a fragment of verse text (not the whole verse structure).
+    IMPORTANT: Markup should already be resolved by scan_markup before calling this.
+    """
 
     # Collapse whitespace early
-    line = re.sub(r"\s+", " ", line).strip()
+    line = _WS_RE.sub(" ", line).strip()
 
     # Fix contractions/possessives: apostrophe BETWEEN letters
     # don ' t -> don't, Yahweh ’s -> Yahweh’s
-    line = re.sub(r"(?<=\w)\s*([’'])\s*(?=\w)", r"\1", line)
+    line = _APOS_RE.sub(r"\1", line)
 
     # Quote spacing:
     # Remove spaces AFTER opening quotes: ‘ I -> ‘I, “ I -> “I, ' I -> 'I
-    line = re.sub(r"([‘“'\"])\s+(\w)", r"\1\2", line)
+    line = _QOPEN_RE.sub(r"\1\2", line)
 
     # Ensure a space AFTER closing double quotes when a word follows: ”for -> ” for
-    line = re.sub(r"([”\"])(\w)", r"\1 \2", line)
+    line = _QCLOSE_RE.sub(r"\1 \2", line)
 
     # Ensure a space AFTER closing single quote ONLY when it follows punctuation:
     # ;’for -> ;’ for
-    line = re.sub(r"([,.;:!?])([’'])(\w)", r"\1\2 \3", line)
+    line = _QPUNCT_RE.sub(r"\1\2 \3", line)
 
     # Remove space before common punctuation
-    line = re.sub(r"\s+([,.;:!?])", r"\1", line)
+    line = _PUNCT_SPACE_RE.sub(r"\1", line)
 
     return line
 
@@ -170,10 +199,18 @@ STRUCT_DELIM = "\u241E"  # ␞ (record separator symbol)
 STYLE_HDG = f"{STRUCT_DELIM}STYLE:HDG{STRUCT_DELIM}"
 STYLE_PARA = f"{STRUCT_DELIM}STYLE:PARA{STRUCT_DELIM}"
 
-def encode_chunk(kind: str, indent: int, text: str) -> str:
+def write_chunk(buf: StringIO, kind: str, indent: int, text: str):
+    """Append one encoded chunk to a verse buffer, space-separated from the previous one."""
+    if buf.tell():
+        buf.write(" ")
+    buf.write(STRUCT_DELIM)
     if kind == "q":
-        return f"{STRUCT_DELIM}Q:{indent}{STRUCT_DELIM}{text}"
-    return f"{STRUCT_DELIM}P{STRUCT_DELIM}{text}"
+        buf.write("Q:")
+        buf.write(str(indent))
+    else:
+        buf.write("P")
+    buf.write(STRUCT_DELIM)
+    buf.write(text)
 
 
 # ----------------------------
@@ -188,6 +225,9 @@ def parse_usfm_file(path: Path):
     - Preserves poetry structure via \\q/\\q1/\\q2, \\m, \\p (encoded into the verse string)
     - Normalises inline tags and spacing
 
+    Lines are dispatched on their leading marker token, so each line costs one
+    dict lookup plus at most one regex match for parameter extraction.
+
     Returns: (book_id, verses_dict)
     """
     book = None
@@ -195,129 +235,139 @@ def parse_usfm_file(path: Path):
     verses = {}  # key: "CH:V" -> encoded verse text with FOOTNOTE_DELIM markers
 
     current_v = None
-    chunks = []    # list of encoded chunks (poetry/prose)
+    chunks = StringIO()    # encoded chunks (poetry/prose) of the current verse
     after_d = False
     after_p = False
+
+    # Hot callables bound to locals so the per-line handlers skip global/attribute lookups
+    v_match = V_RE.match
+    scan = scan_markup
+    normalise = normalise_line
     
     def flush_current():
-        nonlocal current_v, chunks
+        if current_v is not None:
+            verses[current_v] = chunks.getvalue().strip()
+        chunks.seek(0)
+        chunks.truncate()
+
+    def add_chunk(kind: str, indent: int, raw_text: str):
+        t = normalise(scan(raw_text))
+        if t:
+            write_chunk(chunks, kind, indent, t)
+
+    # Each handler takes (tag, rest) and returns True if it consumed the line;
+    # False falls through to the default prose-continuation handling.
+    def handle_d(tag: str, rest: str) -> bool:
+        nonlocal after_d
+        # we don't need to store \d itself for our purposes; just remember it
+        after_d = True
+        return True
+
+    def handle_c(tag: str, rest: str) -> bool:
+        nonlocal chapter, current_v
+        if not rest.isdecimal():
+            return False
+        flush_current()
+        chapter = int(rest)
+        current_v = None
+        return True
+
+    def handle_v(tag: str, rest: str) -> bool:
+        nonlocal current_v, after_d, after_p
+        m = v_match(rest)
+        if not m or chapter is None:
+            return False
+        flush_current()
+
+        vnum = int(m.group(1))
+        vsuf = (m.group(2) or "").lower()   # '', 'a', 'b', ...
+        current_v = f"{chapter}:{vnum}{vsuf}"
+
+        raw_text = m.group(3)
+        # If it follows \d, treat as a heading-verse
+        # (\d context only applies to the immediate next verse)
+        is_heading_verse = after_d
+        after_d = False
+        # If it follows \p, treat as a paragraph starter
+        is_para = after_p
+        after_p = False
+
+        t = normalise(scan(raw_text))
+        if t:
+            if is_heading_verse:
+                t = STYLE_HDG + t
+            if is_para:
+                t = STYLE_PARA + t
+            write_chunk(chunks, "p", 0, t)
+        return True
+
+    # Continuation lines: poetry markers or prose paragraphs within a verse
+    def handle_q(tag: str, rest: str) -> bool:
+        # Poetry line: \q, \q1, \q2 ...
+        # A bare marker line has no text to clean, so consume it without scanning
+        if current_v is not None and rest:
+            add_chunk("q", int(tag[2:] or "1"), rest)
+        return True
+
+    def handle_m(tag: str, rest: str) -> bool:
+        # Poetry paragraph (flush-left)
+        if current_v is not None and rest:
+            add_chunk("q", 1, rest)
+        return True
+
+    def handle_p(tag: str, rest: str) -> bool:
+        nonlocal after_p
+        if not rest:
+            # we don't need to store \p itself for our purposes; just remember it
+            after_p = True
+            return True
+        # Prose paragraph marker
         if current_v is None:
-            chunks = []
-            return
-
-        text = " ".join(chunks).strip()
-
-        verses[current_v] = text
-        chunks = []
-
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        for raw in f:
-            line = raw.rstrip("\n")
-
-            # Book id
-            if line.startswith("\\id "):
-                parts = line.strip().split()
-                if len(parts) >= 2:
-                    book = parts[1].upper()
-                continue
-
-            s = line.strip()
-
-            if s == r"\d" or s.startswith(r"\d "):
-                # we don't need to store \d itself for our purposes; just remember it
-                after_d = True
-                continue
-            if s == r"\p" or s == r"\p ":
-                # we don't need to store \p itself for our purposes; just remember it
-                after_p = True
-                continue
-            # Chapter marker
-            m = C_RE.match(s)
-            if m:
-                flush_current()
-                chapter = int(m.group(1))
-                current_v = None
-                continue
-
-            # Verse marker
-            m = V_RE.match(s)
-            if m and chapter is not None:
-                flush_current()
-
-                vnum = int(m.group(1))
-                vsuf = (m.group(2) or "").lower()   # '', 'a', 'b', ...
-                current_v = f"{chapter}:{vnum}{vsuf}"
-
-                # start verse with any pending headings (if you still have that feature)
-                # if pending_headings:
-                #     chunks.extend(pending_headings)
-                #     pending_headings = []
-
-                raw_text = m.group(3)
-                is_heading_verse = False
-                is_para = False
-                # If it follows \d, treat as a heading-verse
-                if after_d:
-                    is_heading_verse = True
-                    after_d = False  # consumed the \d context
-                else:
-                    after_d = False  # \d context only applies to the immediate next verse
-                # If it follows \p, treat as a paragraph starter
-                if after_p:
-                    is_para = True
-                    after_p = False  # consumed the \d context
-                else:
-                    after_p = False  # \d context only applies to the immediate next verse
-
-                raw_text = extract_usfm_footnotes(raw_text)
-                t = normalise_line(raw_text)
-                if t:
-                    if is_heading_verse:
-                        t = STYLE_HDG + t
-                    if is_para:
-                        t = STYLE_PARA + t
-                    chunks.append(encode_chunk("p", 0, t))
-                continue
-            
-            # Continuation lines: may contain poetry markers or prose continuation
-            if current_v is not None and s:
-                # Poetry line?
-                qm = Q_RE.match(s)
-                if qm:
-                    level = int(qm.group(1) or "1")
-                    raw_text = qm.group(2)
-                    raw_text = extract_usfm_footnotes(raw_text)
-                    t = normalise_line(raw_text)
-                    if t:
-                        chunks.append(encode_chunk("q", level, t))
-                    continue
-
-                # Poetry paragraph (flush-left)
-                mm = M_RE.match(s)
-                if mm:
-                    raw_text = mm.group(1)
-                    raw_text = extract_usfm_footnotes(raw_text)
-                    t = normalise_line(raw_text)
-                    if t:
-                        chunks.append(encode_chunk("q", 1, t))
-                    continue
-
-                # Prose paragraph marker
-                pm = P_RE.match(s)
-                if pm:
-                    raw_text = STYLE_PARA + pm.group(1)
-                    raw_text = extract_usfm_footnotes(raw_text)
-                    t = normalise_line(raw_text)
-                    if t:
-                        chunks.append(encode_chunk("p", 0, t))
-                    continue
-
-                # Default continuation line (treat as prose continuation)
-                raw_text = s
-                raw_text = extract_usfm_footnotes(raw_text)
-                t = normalise_line(raw_text)
-                if t:
-                    chunks.append(encode_chunk("p", 0, t))
+            return False
+        add_chunk("p", 0, STYLE_PARA + rest)
+        return True
+
+    HANDLERS = {
+        "\\c": handle_c,
+        "\\v": handle_v,
+        "\\q": handle_q,
+        "\\q1": handle_q,
+        "\\q2": handle_q,
+        "\\m": handle_m,
+        "\\p": handle_p,
+        "\\d": handle_d,
+    }
+
+    get_handler = HANDLERS.get
+
+    # Decode the whole file once and split on "\n" only, like the file iterator did
+    # (splitlines() would also break on \x0c, \x85, \u2028, ...); strip() drops any "\r"
+    data = path.read_text(encoding="utf-8", errors="ignore")
+    for line in data.split("\n"):
+        # Book id
+        if line.startswith("\\id "):
+            parts = line.strip().split()
+            if len(parts) >= 2:
+                book = parts[1].upper()
+            continue
+
+        s = line.strip()
+
+        # Split on any whitespace (tab, NBSP, ...), as the old \s+ marker regexes did
+        parts = s.split(None, 1)
+        if not parts:
+            continue
+        tag = parts[0]
+        rest = parts[1] if len(parts) > 1 else ""
+        handler = get_handler(tag)
+        if handler is None and tag[:2] == "\\q" and tag[2:].isdecimal():
+            handler = handle_q   # deeper indents: \q3, \q4 ...
+        if handler is not None and handler(tag, rest):
+            continue
+
+        # Default continuation line (treat as prose continuation)
+        if current_v is not None and s:
+            add_chunk("p", 0, s)
 
     flush_current()
     return book, verses
@@ -331,9 +381,12 @@ def find_book_file(folder: Path, book_id: str) -> Path:
     Find a USFM file whose \id matches book_id (e.g. JER).
     Falls back to filename contains book_id.
     """
+    # Only the \id line matters, so sniff the first bytes rather than reading the file
+    marker = b"\\id " + book_id.encode()
     for p in folder.rglob("*.usfm"):
-        txt = p.read_text(encoding="utf-8", errors="ignore")
-        if txt.startswith("\\id " + book_id):
+        with p.open("rb") as f:
+            head = f.read(64)
+        if head.startswith(marker):
             return p
     for p in folder.rglob(f"*{book_id}*.usfm"):
         return p
@@ -343,6 +396,31 @@ def find_book_file(folder: Path, book_id: str) -> Path:
 # ----------------------------
 # Main
 # ----------------------------
+def write_json(path: Path, verses: dict):
+    """Write compact JSON: it is a build artefact read only by 04_build_parallel_csv.py."""
+    if _json.__name__ == "orjson":
+        path.write_bytes(_json.dumps(verses))
+    else:
+        path.write_text(_json.dumps(verses, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+def run_job(label: str, book_id: str, folders: list[Path]):
+    """
+    Locate and parse one edition's book; runs in a worker process.
+
+    Returns: (label, book_id, usfm_path, verses_dict)
+    """
+    candidates = [p for p in folders if label.lower() in p.name.lower()]
+    if candidates:
+        base = candidates[0]
+    else:
+        raise RuntimeError(f"Not able to find a USFM file under {USFM_ROOT} matching {label}:{book_id}.")
+
+    usfm_path = find_book_file(base, book_id)
+    book, verses = parse_usfm_file(usfm_path)
+    return label, book_id, usfm_path, verses
+
+
 def main():
     # Adjust book ids if your set uses a different code for Jeremiah.
     jobs = [
@@ -355,18 +433,14 @@ def main():
     if not folders:
         raise RuntimeError(f"No unpacked USFM folders found under {USFM_ROOT}. Run 01_unpack_sources.py first.")
 
-    for label, book_id in jobs:
-        candidates = [p for p in folders if label.lower() in p.name.lower()]
-        if candidates:
-            base = candidates[0]
-        else:
-            raise RuntimeError(f"Not able to find a USFM file under {USFM_ROOT} matching {label}:{book_id}.")
-
-        usfm_path = find_book_file(base, book_id)
-        book, verses = parse_usfm_file(usfm_path)
+    # The editions are independent, so parse them in parallel and write in order
+    with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [pool.submit(run_job, label, book_id, folders) for label, book_id in jobs]
+        results = [f.result() for f in futures]
 
+    for label, book_id, usfm_path, verses in results:
         out_path = OUT / f"{label}_{book_id}.json"
-        out_path.write_text(json.dumps(verses, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(out_path, verses)
         print(f"Wrote {out_path} ({len(verses)} verses) from {usfm_path}")
 
 if __name__ == "__main__":
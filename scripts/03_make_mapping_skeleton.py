@@ -1,3 +1,4 @@
+import functools
 import json
 import csv
 from pathlib import Path
@@ -10,6 +11,7 @@ import re
 
 REF_RE = re.compile(r'^(\d+):(\d+)([a-z]?)$', re.IGNORECASE)
 
+@functools.lru_cache(maxsize=4096)
 def parse_ref(ref: str) -> tuple[int, int, str]:
     """
     Parses '24:40a' -> (24, 40, 'a')
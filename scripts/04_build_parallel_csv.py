@@ -1,6 +1,11 @@
-import csv, json, re, argparse
+import csv, re, argparse, functools
 from pathlib import Path
 
+try:
+    import orjson as _json
+except ImportError:  # stdlib json also decodes UTF-8 bytes directly
+    import json as _json
+
 parser = argparse.ArgumentParser()
 parser.add_argument("-b", action="store_true", help="Use the British English version of WEB")
 
@@ -23,6 +28,7 @@ import re
 
 REF_RE = re.compile(r'^(\d+):(\d+)([a-z]?)$', re.IGNORECASE)
 
+@functools.lru_cache(maxsize=4096)
 def parse_ref(ref: str) -> tuple[int, int, str]:
     """
     Parses '24:40a' -> (24, 40, 'a')
@@ -77,8 +83,8 @@ def sort_key(ref: str):
     return ref_to_tuple(ref)
 
 def main():
-    lxx_dict = json.loads(LXX.read_text(encoding="utf-8"))
-    mt_dict  = json.loads(MT.read_text(encoding="utf-8"))
+    lxx_dict = _json.loads(LXX.read_bytes())
+    mt_dict  = _json.loads(MT.read_bytes())
 
     rows = []
     with MAP.open(newline="", encoding="utf-8") as f:
@@ -89,21 +95,16 @@ def main():
             lxx_txt = lxx_dict.get(lxx_ref, "")
             mt_txt  = get_mt_text(mt_dict, mt_ref)
 
-            rows.append({
-                "lxx_ref": lxx_ref,
-                "lxx_text": lxx_txt,
-                "mt_ref": mt_ref if mt_ref else "—",
-                "mt_text": mt_txt
-            })
+            rows.append((ref_sort_key(lxx_ref), lxx_ref, lxx_txt, mt_ref if mt_ref else "—", mt_txt))
 
-    # Ensure LXX order
-    rows.sort(key=lambda x: ref_sort_key(x["lxx_ref"]))
+    # Ensure LXX order (sort key computed once per row above)
+    rows.sort(key=lambda x: x[0])
 
     OUT.parent.mkdir(parents=True, exist_ok=True)
-    with OUT.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["lxx_ref","lxx_text","mt_ref","mt_text"])
-        w.writeheader()
-        w.writerows(rows)
+    with OUT.open("w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(["lxx_ref", "lxx_text", "mt_ref", "mt_text"])
+        w.writerows(r[1:] for r in rows)
 
     print(f"Wrote {OUT} ({len(rows)} rows)")
 
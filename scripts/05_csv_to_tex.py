@@ -1,4 +1,6 @@
 import csv, argparse
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
 parser = argparse.ArgumentParser()
@@ -14,20 +16,37 @@ else:
     INP = ROOT / "build" / "jeremiah_parallel.csv"
     OUT = ROOT / "tex" / "jeremiah_parallel.tex"
 
-FOOTNOTE_DELIM = "\u241EFOOTNOTE\u241E"
+FOOTNOTE_DELIM = "\uE000"   # Private Use Area: never occurs in source text
 
 import re
 
-HEBREW_RE = re.compile(r'[\u0590-\u05FF]+')
-ADD_OPEN = "\u241EADDOPEN\u241E"
-ADD_CLOSE = "\u241EADDCLOSE\u241E"
-SC_OPEN = "\u241ESCOPEN\u241E"
-SC_CLOSE = "\u241ESCCLOSE\u241E"
-SUP_OPEN = "\u241ESUPOPEN\u241E"
-SUP_CLOSE = "\u241ESUPCLOSE\u241E"
-
-def wrap_hebrew(text):
-    return HEBREW_RE.sub(lambda m: r'\texthebrew{' + m.group(0) + '}', text)
+ADD_OPEN = "\uE001"
+ADD_CLOSE = "\uE002"
+SC_OPEN = "\uE003"
+SC_CLOSE = "\uE004"
+SUP_OPEN = "\uE005"
+SUP_CLOSE = "\uE006"
+
+_MARKER_LATEX = {
+    ADD_OPEN: r"\textit{",
+    ADD_CLOSE: "}",
+    SC_OPEN: r"\textsc{",
+    SC_CLOSE: "}",
+    SUP_OPEN: r"\textsuperscript{",
+    SUP_CLOSE: "}",
+}
+
+# Hebrew runs and style markers are rewritten together in one pass
+_WRAP_RE = re.compile(r"(?P<heb>[\u0590-\u05FF]+)|(?P<m>[\uE001-\uE006])")
+
+def _wrap_repl(m) -> str:
+    heb = m["heb"]
+    if heb:
+        return r'\texthebrew{' + heb + '}'
+    return _MARKER_LATEX[m["m"]]
+
+def render_inline(escaped_text: str) -> str:
+    return _WRAP_RE.sub(_wrap_repl, escaped_text)
 
 def inject_latex_footnotes(escaped_text: str) -> str:
     # escaped_text is already LaTeX-escaped
@@ -45,29 +64,31 @@ def inject_latex_footnotes(escaped_text: str) -> str:
             out.append(parts[i + 1])
     return "".join(out)
 
+# Single-character LaTeX escapes, applied in one str.translate pass.
+# translate does a dict lookup per character, so cells without any special
+# character (nearly all of them) are returned untouched after a regex scan.
+_ESC_SPECIAL_RE = re.compile(r"[\\&%$#_{}~^]")
+_ESC_TABLE = str.maketrans({
+    "\\": r"\textbackslash{}",
+    "&": r"\&", "%": r"\%", "$": r"\$",
+    "#": r"\#", "_": r"\_", "{": r"\{", "}": r"\}",
+    "~": r"\textasciitilde{}", "^": r"\textasciicircum{}",
+})
+
 def esc(s: str) -> str:
     if s is None:
         return ""
-    s = s.replace("\\", r"\textbackslash{}")
-    s = s.replace("&", r"\&").replace("%", r"\%").replace("$", r"\$")
-    s = s.replace("#", r"\#").replace("_", r"\_").replace("{", r"\{").replace("}", r"\}")
-    s = s.replace("~", r"\textasciitilde{}").replace("^", r"\textasciicircum{}")
-    return s
+    if _ESC_SPECIAL_RE.search(s) is None:
+        return s
+    return s.translate(_ESC_TABLE)
 
 STRUCT_DELIM = "\u241E"
 STYLE_HDG = f"{STRUCT_DELIM}STYLE:HDG{STRUCT_DELIM}"
 STYLE_PARA = f"{STRUCT_DELIM}STYLE:PARA{STRUCT_DELIM}"
 
 
-def render_markers(escaped_text: str) -> str:
-    return (escaped_text
-            .replace(ADD_OPEN, r"\textit{")
-            .replace(ADD_CLOSE, "}")
-            .replace(SC_OPEN, r"\textsc{")
-            .replace(SC_CLOSE, "}")
-            .replace(SUP_OPEN, r"\textsuperscript{")
-            .replace(SUP_CLOSE, "}")
-           )
+# One structure segment: ␞TOKEN␞payload, where TOKEN is Q:<n>, P or STYLE:<x>
+_SEG_RE = re.compile(r"\u241E(?P<token>Q:\d*|P|STYLE:(?:HDG|PARA))\u241E(?P<body>[^\u241E]*)")
 
 def render_structured_to_latex(escaped_text: str) -> str:
     if STRUCT_DELIM not in escaped_text:
@@ -77,64 +98,44 @@ def render_structured_to_latex(escaped_text: str) -> str:
         # Space above + bold, but still stays in the column (not spanning both)
         return r"\DescriptiveHeading{" + text.strip() + r"}"
 
-    parts = escaped_text.split(STRUCT_DELIM)
     out = []
-    i = 0
     pending_heading = False
     PILCROW = r"{\small\textparagraph\thinspace}"
-    
-    while i < len(parts):
-        token = parts[i]
-
-        # Our style marker is a standalone token after splitting
-        if token == "STYLE:HDG":
-            pending_heading = True
-            i += 1
-            continue
-
-        if token.startswith("Q:"):
-            indent = int(token[2:]) if token[2:].isdigit() else 1
-            if i + 1 < len(parts):
-                line = parts[i + 1].strip()
-                # If you ever tag a poem line as heading, you can decide what to do here.
-                out.append(rf"\poemline{{{indent}}}{{{line}}}")
-                i += 2
-            else:
-                i += 1
 
-        elif token == "P":
-            if i+2 < len(parts) and parts[i+2] == "STYLE:PARA":
-                i += 2
+    # Plain text ahead of the first structure token
+    lead = escaped_text[:escaped_text.index(STRUCT_DELIM)].strip()
+    if lead:
+        out.append(lead + " ")
+
+    for m in _SEG_RE.finditer(escaped_text):
+        token = m["token"]
+        body = m["body"].strip()
+
+        match token:
+            case "P":
+                pass
+            case "STYLE:HDG":
+                pending_heading = True
+            case "STYLE:PARA":
                 if len(out):
                     out.append(r"\par" + PILCROW)
                 else:
                     out.append(PILCROW)
-                
-            if i + 1 < len(parts):
-                seg = parts[i + 1].strip()
-
-                # Sometimes seg is empty because the verse starts with ␞STYLE:HDG␞
-                # In that case, just skip the empty payload.
-                if seg:
-                    if pending_heading:
-                        out.append(render_heading_verse(seg) + " ")
-                        pending_heading = False
-                    else:
-                        out.append(seg + " ")
-                i += 2
+            case _:
+                # Q:<n> poetry line
+                indent = int(token[2:] or "1")
+                # If you ever tag a poem line as heading, you can decide what to do here.
+                out.append(rf"\poemline{{{indent}}}{{{body}}}")
+                continue
+
+        # Sometimes body is empty because the verse starts with ␞STYLE:HDG␞
+        # In that case, just skip the empty payload.
+        if body:
+            if pending_heading:
+                out.append(render_heading_verse(body) + " ")
+                pending_heading = False
             else:
-                i += 1
-
-        else:
-            # Fallback: plain text token
-            if token.strip():
-                if pending_heading:
-                    out.append(render_heading_verse(token) + " ")
-                    pending_heading = False
-                else:
-                    out.append(token.strip() + " ")
-
-            i += 1
+                out.append(body + " ")
 
     rendered = "".join(out).strip()
 
@@ -143,43 +144,41 @@ def render_structured_to_latex(escaped_text: str) -> str:
     return rendered
 
 
-def parse_ref(ref: str) -> tuple[int, int]:
-    # ref like "12:7" (ignore any suffixes if you later add them)
-    ch_s, v_s = ref.split(":", 1)
-    # if you ever use 7a/7* etc, keep only leading digits for verse
-    v_digits = "".join(c for c in v_s if c.isdigit())
-    return int(ch_s), int(v_digits) if v_digits else 0
-
 def main():
     rows = []
     with INP.open(newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-
-    OUT.parent.mkdir(parents=True, exist_ok=True)
-    with OUT.open("w", encoding="utf-8") as out:
-        out.write(r"""
+        reader = csv.reader(f)
+        # Look columns up by header name once, then pick them positionally per row
+        idx = {name: i for i, name in enumerate(next(reader))}
+        pick = itemgetter(idx["lxx_ref"], idx["lxx_text"], idx["mt_ref"], idx["mt_text"])
+        rows = list(map(pick, reader))
+
+    # Build the whole document in memory and write it once
+    buf = []
+    emit = buf.append
+    emit(r"""
 \section*{Jeremiah Parallel Edition — Septuagint order}
 """)
 
-        current_ch = None
-        for r in rows:
-            ch, _ = parse_ref(r["lxx_ref"])
-            if ch != current_ch:
-                if current_ch is not None:
-                    out.write("\\end{paracol}\n")
-                out.write(f"\\ChapterHeading{{{ch}}}\n")
-                out.write("\\begin{paracol}{2}\n")
-                current_ch = ch
-
-            lxx_ref = esc(r["lxx_ref"])
-            mt_ref  = esc(r["mt_ref"])
-            lxx_txt = render_structured_to_latex(inject_latex_footnotes(render_markers(wrap_hebrew(esc(r["lxx_text"])))))
-            mt_txt  = render_structured_to_latex(inject_latex_footnotes(render_markers(wrap_hebrew(esc(r["mt_text"])))))
-            out.write(f"\\VersePair{{{lxx_ref}}}{{{lxx_txt}}}{{{mt_ref}}}{{{mt_txt}}}\n")
-
-        out.write(r"""\end{paracol}
-\end{document}
+    # Rows are in LXX order, so each chapter is one contiguous group
+    for ch, group in groupby(rows, key=lambda r: int(r[0].split(":", 1)[0])):
+        emit(f"\\ChapterHeading{{{ch}}}\n")
+        emit("\\begin{paracol}{2}\n")
+
+        for lxx_ref, lxx_text, mt_ref, mt_text in group:
+            lxx_ref = esc(lxx_ref)
+            mt_ref  = esc(mt_ref)
+            lxx_txt = render_structured_to_latex(inject_latex_footnotes(render_inline(esc(lxx_text))))
+            mt_txt  = render_structured_to_latex(inject_latex_footnotes(render_inline(esc(mt_text))))
+            emit(f"\\VersePair{{{lxx_ref}}}{{{lxx_txt}}}{{{mt_ref}}}{{{mt_txt}}}\n")
+
+        emit("\\end{paracol}\n")
+
+    emit(r"""\end{document}
 """)
+
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+    OUT.write_text("".join(buf), encoding="utf-8")
     print(f"Wrote {OUT}")
 
 if __name__ == "__main__":